@@ -0,0 +1,222 @@
+"""
+Semantic response cache for the First Agent.
+
+Queries are embedded and compared by cosine similarity against previously answered
+queries, so repeated or near-duplicate questions can be answered without running
+the full ReAct loop again.
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, Tuple
+
+from schema import AgentResponse
+
+if TYPE_CHECKING:
+    from langchain_core.embeddings import Embeddings
+
+
+class SemanticCache:
+    """
+    An in-memory, embedding-similarity cache of AgentResponse objects.
+
+    Entries expire after a fixed TTL and the least recently used entry is evicted
+    once the cache is full. Single lookups use embed_query and batches use
+    embed_documents, so the embedding model must embed both the same way (as
+    OpenAI embeddings do).
+    """
+
+    def __init__(
+        self,
+        embeddings: "Embeddings",
+        similarity_threshold: float = 0.92,
+        ttl_seconds: float = 3600.0,
+        max_entries: int = 256
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embeddings: Embedding model used to vectorize queries
+            similarity_threshold: Minimum cosine similarity for a cache hit
+            ttl_seconds: Seconds after which an entry is considered stale
+            max_entries: Maximum number of entries kept before LRU eviction
+        """
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (normalized embedding, serialized response, insertion time)
+        self._entries: "OrderedDict[int, Tuple[List[float], str, float]]" = OrderedDict()
+        self._next_key = 0
+        # Recently embedded queries, so a lookup miss and the following store
+        # embed the query only once
+        self._recent_vectors: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def get(self, query: str) -> Optional[AgentResponse]:
+        """
+        Look up a cached response for a semantically similar query.
+
+        Args:
+            query: The search query
+
+        Returns:
+            The cached AgentResponse, or None on a miss
+        """
+        if not self._has_entries():
+            return None
+        return self._search(self._embed([query], self._embed_query)[0])
+
+    async def aget(self, query: str) -> Optional[AgentResponse]:
+        """Asynchronously look up a cached response for a semantically similar query."""
+        if not self._has_entries():
+            return None
+        vectors = await self._aembed([query], self._aembed_query)
+        return self._search(vectors[0])
+
+    def get_many(self, queries: List[str]) -> List[Optional[AgentResponse]]:
+        """
+        Look up cached responses for several queries with a single embedding call.
+
+        Args:
+            queries: The search queries
+
+        Returns:
+            The cached AgentResponse for each query, or None where it misses
+        """
+        if not self._has_entries():
+            return [None] * len(queries)
+        return [self._search(v) for v in self._embed(queries, self.embeddings.embed_documents)]
+
+    async def aget_many(self, queries: List[str]) -> List[Optional[AgentResponse]]:
+        """Asynchronously look up cached responses for several queries."""
+        if not self._has_entries():
+            return [None] * len(queries)
+        vectors = await self._aembed(queries, self.embeddings.aembed_documents)
+        return [self._search(v) for v in vectors]
+
+    def put(self, query: str, response: AgentResponse) -> None:
+        """
+        Store a response for a query.
+
+        Args:
+            query: The search query
+            response: The AgentResponse produced for the query
+        """
+        self._insert(self._embed([query], self._embed_query)[0], response)
+
+    async def aput(self, query: str, response: AgentResponse) -> None:
+        """Asynchronously store a response for a query."""
+        vectors = await self._aembed([query], self._aembed_query)
+        self._insert(vectors[0], response)
+
+    def put_many(self, queries: List[str], responses: List[AgentResponse]) -> None:
+        """
+        Store responses for several queries with a single embedding call.
+
+        Args:
+            queries: The search queries
+            responses: The AgentResponse produced for each query
+        """
+        vectors = self._embed(queries, self.embeddings.embed_documents)
+        for vector, response in zip(vectors, responses):
+            self._insert(vector, response)
+
+    async def aput_many(self, queries: List[str], responses: List[AgentResponse]) -> None:
+        """Asynchronously store responses for several queries."""
+        vectors = await self._aembed(queries, self.embeddings.aembed_documents)
+        for vector, response in zip(vectors, responses):
+            self._insert(vector, response)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+        self._recent_vectors.clear()
+
+    def _has_entries(self) -> bool:
+        """Drop expired entries and report whether any remain."""
+        self._evict_expired()
+        return bool(self._entries)
+
+    def _search(self, vector: List[float]) -> Optional[AgentResponse]:
+        """Return the response of the most similar cached query above the threshold."""
+        if not self._entries:
+            return None
+
+        # Embeddings are stored L2-normalized, so the dot product is the cosine
+        # similarity; math.sumprod runs the inner loop in C.
+        best_score, best_key = max(
+            (math.sumprod(vector, cached_vector), key)
+            for key, (cached_vector, _, _) in self._entries.items()
+        )
+
+        if best_score < self.similarity_threshold:
+            return None
+
+        self._entries.move_to_end(best_key)
+        return AgentResponse.model_validate_json(self._entries[best_key][1])
+
+    def _insert(self, vector: List[float], response: AgentResponse) -> None:
+        """Add an entry, evicting the least recently used ones when full."""
+        self._entries[self._next_key] = (vector, response.model_dump_json(), time.monotonic())
+        self._next_key += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _embed(
+        self,
+        queries: List[str],
+        embed_documents: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """Embed and L2-normalize queries, embedding only those not seen recently."""
+        missing = self._missing(queries)
+        if missing:
+            self._remember(missing, embed_documents(missing))
+        return self._lookup_vectors(queries)
+
+    async def _aembed(
+        self,
+        queries: List[str],
+        aembed_documents: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """Asynchronously embed and L2-normalize queries not seen recently."""
+        missing = self._missing(queries)
+        if missing:
+            self._remember(missing, await aembed_documents(missing))
+        return self._lookup_vectors(queries)
+
+    def _embed_query(self, queries: List[str]) -> List[List[float]]:
+        """Embed a single query with embed_query."""
+        return [self.embeddings.embed_query(queries[0])]
+
+    async def _aembed_query(self, queries: List[str]) -> List[List[float]]:
+        """Asynchronously embed a single query with aembed_query."""
+        return [await self.embeddings.aembed_query(queries[0])]
+
+    def _missing(self, queries: List[str]) -> List[str]:
+        """Return the distinct queries that have no recent embedding."""
+        return [q for q in dict.fromkeys(queries) if q not in self._recent_vectors]
+
+    def _remember(self, queries: List[str], vectors: List[List[float]]) -> None:
+        """Normalize and keep embeddings for recently seen queries."""
+        for query, vector in zip(queries, vectors):
+            norm = math.hypot(*vector) or 1.0
+            self._recent_vectors[query] = [x / norm for x in vector]
+            self._recent_vectors.move_to_end(query)
+
+    def _lookup_vectors(self, queries: List[str]) -> List[List[float]]:
+        """Return recent embeddings for queries, then trim the recent set."""
+        vectors = [self._recent_vectors[q] for q in queries]
+        for query in queries:
+            self._recent_vectors.move_to_end(query)
+        while len(self._recent_vectors) > max(self.max_entries, len(set(queries))):
+            self._recent_vectors.popitem(last=False)
+        return vectors
+
+    def _evict_expired(self) -> None:
+        """Drop entries older than the configured TTL."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [key for key, (_, _, created) in self._entries.items() if created < cutoff]
+        for key in expired:
+            del self._entries[key]
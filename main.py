@@ -5,23 +5,160 @@ This module provides a clean, modular implementation of a ReAct agent that can s
 for information using various tools and return structured responses.
 """
 
+import functools
+import hashlib
 import json
 import os
-from typing import Dict, List, Any, Optional
+import sys
+from operator import itemgetter
+from typing import (
+    TYPE_CHECKING, AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple, Type
+)
 from dotenv import load_dotenv
 
-from langchain import hub
-from langchain.agents import AgentExecutor
-from langchain.agents.react.agent import create_react_agent
-from langchain_anthropic import ChatAnthropic
-from langchain_core.output_parsers.pydantic import PydanticOutputParser
-from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableLambda
-from langchain_tavily import TavilySearch
+from pydantic import BaseModel, ValidationError
 
-from prompt import REACT_PROMPT_WITH_FORMAT_INSTRUCTIONS
+from cache import SemanticCache
+from prompt import REACT_QUESTION_PROMPT, REACT_SYSTEM_PROMPT
 from schema import AgentResponse
 
+# LangChain integrations are imported lazily inside the factory methods below,
+# which keeps module import (and CLI cold-start) cheap.
+if TYPE_CHECKING:
+    from langchain.agents import AgentExecutor
+    from langchain_anthropic import ChatAnthropic
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_tavily import TavilySearch
+
+# Sentinel marking the end of an agent stream
+_STREAM_DONE = object()
+
+_HEAVY_RULE = "=" * 60
+_LIGHT_RULE = "─" * 40
+
+
+@functools.lru_cache(maxsize=4)
+def _build_prompt(
+    schema_cls: Type[BaseModel],
+    tools: str,
+    tool_names: str
+) -> "ChatPromptTemplate":
+    """
+    Build the ReAct prompt for a schema and tool set.
+    
+    The static ReAct instructions are rendered once into a plain system message,
+    marked for Anthropic prompt caching, so only the question and scratchpad are
+    templated per call. The result is cached so the Pydantic JSON schema is only
+    rendered once per process, not on every SearchAgent instantiation.
+    
+    Args:
+        schema_cls: Pydantic model the final answer should conform to
+        tools: Text description of the tools available to the agent
+        tool_names: Comma-separated names of those tools
+        
+    Returns:
+        ChatPromptTemplate taking only input and agent_scratchpad
+    """
+    from langchain_core.messages import SystemMessage
+    from langchain_core.output_parsers.pydantic import PydanticOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+    
+    format_instructions = PydanticOutputParser(
+        pydantic_object=schema_cls
+    ).get_format_instructions()
+    system_prompt = REACT_SYSTEM_PROMPT.format(
+        tools=tools,
+        tool_names=tool_names,
+        format_instructions=format_instructions
+    )
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=[{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }]),
+        ("human", REACT_QUESTION_PROMPT),
+    ])
+
+
+def _key_fingerprint(env_var: str) -> str:
+    """Return a digest of an API key from the environment, so caches never hold the raw key."""
+    return hashlib.sha256(os.environ.get(env_var, "").encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def _build_llm(
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    max_retries: int,
+    key_fingerprint: str
+) -> "ChatAnthropic":
+    """
+    Build a ChatAnthropic model, shared by all agents with the same settings.
+    
+    Args:
+        model_name: Anthropic model identifier
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        max_retries: Retries on transient API errors
+        key_fingerprint: Digest of ANTHROPIC_API_KEY, so a changed key gets a new model
+        
+    Returns:
+        Configured ChatAnthropic instance
+    """
+    from langchain_anthropic import ChatAnthropic
+    
+    return ChatAnthropic(
+        model=model_name,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        max_retries=max_retries
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _build_structured_llm(
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    max_retries: int,
+    key_fingerprint: str
+) -> Any:
+    """
+    Build the structured-output runnable for the shared model with these settings.
+    
+    The tool schema is derived from AgentResponse once per model configuration
+    rather than once per agent. Arguments are the same as for _build_llm.
+    
+    Returns:
+        Runnable returning validated AgentResponse objects
+    """
+    return _build_llm(
+        model_name,
+        temperature,
+        max_tokens,
+        max_retries,
+        key_fingerprint
+    ).with_structured_output(AgentResponse)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_search_tool(max_results: int, key_fingerprint: str) -> "TavilySearch":
+    """
+    Build a TavilySearch tool, shared by all agents with the same settings.
+    
+    Args:
+        max_results: Maximum number of results returned per search
+        key_fingerprint: Digest of TAVILY_API_KEY, so a changed key gets a new tool
+        
+    Returns:
+        Configured TavilySearch instance
+    """
+    from langchain_tavily import TavilySearch
+    
+    return TavilySearch(max_results=max_results)
+
 
 class SearchAgentConfig:
     """Configuration class for the First Agent."""
@@ -31,12 +168,31 @@ class SearchAgentConfig:
         model_name: str = "claude-3-5-sonnet-latest",
         temperature: float = 0.0,
         max_tokens: int = 512,
-        verbose: bool = False
+        verbose: bool = False,
+        *,
+        max_retries: int = 2,
+        search_max_results: int = 3,
+        max_iterations: int = 15,
+        enable_tracing: bool = False,
+        enable_cache: bool = False,
+        embedding_model: str = "text-embedding-3-small",
+        cache_similarity_threshold: float = 0.92,
+        cache_ttl_seconds: float = 3600.0,
+        cache_max_entries: int = 256
     ):
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.verbose = verbose
+        self.max_retries = max_retries
+        self.search_max_results = search_max_results
+        self.max_iterations = max_iterations
+        self.enable_tracing = enable_tracing
+        self.enable_cache = enable_cache
+        self.embedding_model = embedding_model
+        self.cache_similarity_threshold = cache_similarity_threshold
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
 
 
 class SearchAgent:
@@ -70,52 +226,166 @@ class SearchAgent:
         self.prompt = self._create_prompt()
         self.agent_executor = self._create_agent_executor()
         self.chain = self._create_chain()
+        self.cache = self._create_cache()
     
     def _create_tools(self) -> List[Any]:
         """Create and return the list of tools available to the agent."""
-        return [TavilySearch()]
-    
-    def _create_llm(self) -> ChatAnthropic:
-        """Create and configure the language model."""
-        return ChatAnthropic(
-            model=self.config.model_name,
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens
+        from tools import MultiSearchTool
+        
+        search = _build_search_tool(
+            self.config.search_max_results,
+            _key_fingerprint("TAVILY_API_KEY")
         )
+        return [MultiSearchTool(search=search)]
+    
+    def _create_llm(self) -> "ChatAnthropic":
+        """
+        Create and configure the language model.
+        
+        Agents with the same settings share one model instance, and ChatAnthropic
+        keeps a process-wide httpx client per base URL and timeout, so they also
+        share one connection pool instead of opening new ones.
+        """
+        return _build_llm(*self._llm_settings())
     
     def _create_structured_llm(self) -> Any:
-        """Create a structured LLM that returns validated Pydantic objects."""
-        return self.llm.with_structured_output(AgentResponse)
-    
-    def _create_prompt(self) -> PromptTemplate:
-        """Create the prompt template with format instructions."""
-        # Pull the base ReAct prompt from LangChain hub
-        # react_prompt = hub.pull("hwchase17/react")
-        
-        # Create custom prompt with format instructions
-        return PromptTemplate(
-            input_variables=["tools", "tool_names", "input", "agent_scratchpad"],
-            template=REACT_PROMPT_WITH_FORMAT_INSTRUCTIONS,
-        ).partial(format_instructions='')
-    
-    def _create_agent_executor(self) -> AgentExecutor:
-        """Create the agent and its executor."""
-        agent = create_react_agent(
-            llm=self.llm,
-            tools=self.tools,
-            prompt=self.prompt
+        """
+        Create a structured LLM that returns validated Pydantic objects.
+        
+        The default model's structured runnable is shared by agents with the same
+        settings; a model from an overridden _create_llm gets its own.
+        """
+        if type(self)._create_llm is not SearchAgent._create_llm:
+            return self.llm.with_structured_output(AgentResponse)
+        return _build_structured_llm(*self._llm_settings())
+    
+    def _llm_settings(self) -> Tuple[str, float, int, int, str]:
+        """Return the arguments identifying the shared model for this configuration."""
+        return (
+            self.config.model_name,
+            self.config.temperature,
+            self.config.max_tokens,
+            self.config.max_retries,
+            _key_fingerprint("ANTHROPIC_API_KEY")
+        )
+    
+    def _create_prompt(self) -> "ChatPromptTemplate":
+        """Create the prompt template with tools and format instructions filled in."""
+        from langchain_core.tools import render_text_description
+        
+        return _build_prompt(
+            AgentResponse,
+            render_text_description(self.tools),
+            ", ".join(tool.name for tool in self.tools)
+        )
+    
+    def _create_agent_executor(self) -> "AgentExecutor":
+        """
+        Create the agent and its executor.
+        
+        This is create_react_agent without its per-call tools/tool_names
+        substitution, since _create_prompt already renders them in.
+        """
+        from langchain.agents import AgentExecutor
+        from langchain.agents.format_scratchpad import format_log_to_str
+        from langchain.agents.output_parsers import ReActSingleInputOutputParser
+        from langchain_core.runnables import RunnablePassthrough
+        
+        agent = (
+            RunnablePassthrough.assign(
+                agent_scratchpad=lambda x: format_log_to_str(x["intermediate_steps"])
+            )
+            | self.prompt
+            | self.llm.bind(stop=["\nObservation"])
+            | ReActSingleInputOutputParser()
         )
         
         return AgentExecutor(
             agent=agent,
             tools=self.tools,
+            max_iterations=self.config.max_iterations,
             verbose=self.config.verbose
         )
     
     def _create_chain(self) -> Any:
         """Create the complete chain with structured output."""
-        extract_output = RunnableLambda(lambda x: x['output'])
-        return self.agent_executor | extract_output | self.structured_llm
+        from langchain_core.runnables import RunnableLambda
+        
+        extract_output = RunnableLambda(itemgetter('output'))
+        parse_output = RunnableLambda(self._parse_output, afunc=self._aparse_output)
+        return self.agent_executor | extract_output | parse_output
+    
+    def _parse_output(self, output: str) -> AgentResponse:
+        """
+        Parse the agent's final answer into an AgentResponse.
+        
+        The format instructions ask the agent for AgentResponse JSON, so the
+        structured LLM is only called when that output does not parse.
+        """
+        response = self._extract_response(output)
+        if response is not None:
+            return response
+        return self.structured_llm.invoke(output)
+    
+    async def _aparse_output(self, output: str) -> AgentResponse:
+        """Asynchronously parse the agent's final answer into an AgentResponse."""
+        response = self._extract_response(output)
+        if response is not None:
+            return response
+        return await self.structured_llm.ainvoke(output)
+    
+    def _extract_response(self, output: str) -> Optional[AgentResponse]:
+        """
+        Extract AgentResponse JSON from the agent's final answer without an LLM call.
+        
+        Falls back to the outermost JSON object when the model wraps it in prose.
+        Parsing is strict, so a truncated answer is a miss rather than a partial
+        AgentResponse.
+        
+        Returns:
+            The parsed AgentResponse, or None if no valid JSON answer was found
+        """
+        from langchain_core.utils.json import parse_json_markdown
+        
+        candidates = [output]
+        start, end = output.find("{"), output.rfind("}")
+        if 0 <= start < end:
+            candidates.append(output[start:end + 1])
+        
+        for candidate in candidates:
+            try:
+                return AgentResponse.model_validate(
+                    parse_json_markdown(candidate, parser=json.loads)
+                )
+            except (ValueError, ValidationError):
+                continue
+        return None
+    
+    def _tracing_context(self) -> Any:
+        """
+        Return a context manager applying this agent's tracing setting.
+        
+        LangSmith tracing runs callbacks on every step, so it is off unless enabled
+        in the config. The context override takes precedence over LANGSMITH_TRACING
+        and, unlike the environment, only affects runs started by this agent.
+        """
+        from langsmith import tracing_context
+        
+        return tracing_context(enabled=self.config.enable_tracing)
+    
+    def _create_cache(self) -> Optional[SemanticCache]:
+        """Create the semantic response cache, if enabled in the configuration."""
+        if not self.config.enable_cache:
+            return None
+        
+        from langchain_openai import OpenAIEmbeddings
+        
+        return SemanticCache(
+            embeddings=OpenAIEmbeddings(model=self.config.embedding_model),
+            similarity_threshold=self.config.cache_similarity_threshold,
+            ttl_seconds=self.config.cache_ttl_seconds,
+            max_entries=self.config.cache_max_entries
+        )
     
     def search(self, query: str) -> AgentResponse:
         """
@@ -128,14 +398,262 @@ class SearchAgent:
             AgentResponse object with structured output
         """
         try:
-            result = self.chain.invoke({"input": query})
+            cached = self._lookup_cache(query)
+            if cached is not None:
+                return cached
+            
+            with self._tracing_context():
+                result = self.chain.invoke({"input": query})
+            self._store_cache(query, result)
+            return result
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def asearch(self, query: str) -> AgentResponse:
+        """
+        Asynchronously execute a search query using the agent.
+        
+        Prefer this over search() inside an event loop (e.g. FastAPI/ASGI handlers)
+        so tool and model I/O do not block other tasks.
+        
+        Args:
+            query: The search query to execute
+            
+        Returns:
+            AgentResponse object with structured output
+        """
+        try:
+            cached = await self._alookup_cache(query)
+            if cached is not None:
+                return cached
+            
+            with self._tracing_context():
+                result = await self.chain.ainvoke({"input": query})
+            await self._astore_cache(query, result)
             return result
         except Exception as e:
-            # Return a default AgentResponse on error
-            return AgentResponse(
-                answer=f"Error occurred during search: {str(e)}",
-                playersName=[]
+            return self._error_response(e)
+    
+    def stream_search(self, query: str) -> Iterator[str]:
+        """
+        Execute a search query, yielding the agent's progress as it happens.
+        
+        Each reasoning step (thought and tool call) is yielded as soon as the model
+        produces it, followed by the final answer text. Streaming bypasses the
+        semantic cache; use search() when a structured AgentResponse is needed.
+        
+        Args:
+            query: The search query to execute
+            
+        Yields:
+            Text of each reasoning step, then the final answer
+        """
+        # The tracing override is only active while the stream advances, so it
+        # never leaks into the caller's context while this generator is suspended
+        chunks = self.agent_executor.stream({"input": query})
+        try:
+            while True:
+                with self._tracing_context():
+                    chunk = next(chunks, _STREAM_DONE)
+                if chunk is _STREAM_DONE:
+                    return
+                yield from self._stream_text(chunk)
+        except Exception as e:
+            yield self._error_response(e).answer
+        finally:
+            with self._tracing_context():
+                chunks.close()
+    
+    async def astream_search(self, query: str) -> AsyncIterator[str]:
+        """
+        Asynchronously execute a search query, yielding the agent's progress.
+        
+        Args:
+            query: The search query to execute
+            
+        Yields:
+            Text of each reasoning step, then the final answer
+        """
+        chunks = self.agent_executor.astream({"input": query})
+        try:
+            while True:
+                with self._tracing_context():
+                    chunk = await anext(chunks, _STREAM_DONE)
+                if chunk is _STREAM_DONE:
+                    return
+                for text in self._stream_text(chunk):
+                    yield text
+        except Exception as e:
+            yield self._error_response(e).answer
+        finally:
+            with self._tracing_context():
+                await chunks.aclose()
+    
+    @staticmethod
+    def _stream_text(chunk: Dict[str, Any]) -> List[str]:
+        """Extract the displayable text from an AgentExecutor stream chunk."""
+        if "actions" in chunk:
+            return [action.log for action in chunk["actions"]]
+        if "output" in chunk:
+            return [chunk["output"]]
+        return []
+    
+    def search_batch(self, queries: List[str], max_concurrency: int = 5) -> List[AgentResponse]:
+        """
+        Execute several search queries concurrently using the agent.
+        
+        Args:
+            queries: The search queries to execute
+            max_concurrency: Maximum number of queries in flight at once
+            
+        Returns:
+            AgentResponse objects in the same order as the queries
+        """
+        results = self._lookup_cache_many(queries)
+        pending = [i for i, result in enumerate(results) if result is None]
+        with self._tracing_context():
+            outputs = self.chain.batch(
+                [{"input": queries[i]} for i in pending],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
+            )
+        answered = self._merge_batch(results, pending, outputs)
+        self._store_cache_many([queries[i] for i in answered], [results[i] for i in answered])
+        return results
+    
+    async def asearch_batch(
+        self,
+        queries: List[str],
+        max_concurrency: int = 5
+    ) -> List[AgentResponse]:
+        """
+        Asynchronously execute several search queries concurrently using the agent.
+        
+        Args:
+            queries: The search queries to execute
+            max_concurrency: Maximum number of queries in flight at once
+            
+        Returns:
+            AgentResponse objects in the same order as the queries
+        """
+        results = await self._alookup_cache_many(queries)
+        pending = [i for i, result in enumerate(results) if result is None]
+        with self._tracing_context():
+            outputs = await self.chain.abatch(
+                [{"input": queries[i]} for i in pending],
+                config={"max_concurrency": max_concurrency},
+                return_exceptions=True
             )
+        answered = self._merge_batch(results, pending, outputs)
+        await self._astore_cache_many(
+            [queries[i] for i in answered],
+            [results[i] for i in answered]
+        )
+        return results
+    
+    def _merge_batch(
+        self,
+        results: List[Optional[AgentResponse]],
+        pending: List[int],
+        outputs: List[Any]
+    ) -> List[int]:
+        """
+        Merge batch outputs into the results, mapping failures to error responses.
+        
+        Returns:
+            Indices of the queries that were answered successfully
+        """
+        answered = []
+        for i, output in zip(pending, outputs):
+            if isinstance(output, Exception):
+                results[i] = self._error_response(output)
+            else:
+                results[i] = output
+                answered.append(i)
+        return answered
+    
+    # Cache helpers: caching is optional and best-effort, so a failure (e.g. the
+    # embedding API being unavailable) counts as a miss or a skipped store.
+    
+    def _lookup_cache(self, query: str) -> Optional[AgentResponse]:
+        """Return a cached response for the query, if caching is enabled and it hits."""
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(query)
+        except Exception:
+            return None
+    
+    async def _alookup_cache(self, query: str) -> Optional[AgentResponse]:
+        """Asynchronously return a cached response for the query, if any."""
+        if self.cache is None:
+            return None
+        try:
+            return await self.cache.aget(query)
+        except Exception:
+            return None
+    
+    def _lookup_cache_many(self, queries: List[str]) -> List[Optional[AgentResponse]]:
+        """Return cached responses for a batch of queries, None where they miss."""
+        if self.cache is None:
+            return [None] * len(queries)
+        try:
+            return self.cache.get_many(queries)
+        except Exception:
+            return [None] * len(queries)
+    
+    async def _alookup_cache_many(self, queries: List[str]) -> List[Optional[AgentResponse]]:
+        """Asynchronously return cached responses for a batch of queries."""
+        if self.cache is None:
+            return [None] * len(queries)
+        try:
+            return await self.cache.aget_many(queries)
+        except Exception:
+            return [None] * len(queries)
+    
+    def _store_cache(self, query: str, result: AgentResponse) -> None:
+        """Store a response in the cache, if caching is enabled."""
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(query, result)
+        except Exception:
+            pass
+    
+    async def _astore_cache(self, query: str, result: AgentResponse) -> None:
+        """Asynchronously store a response in the cache, if caching is enabled."""
+        if self.cache is None:
+            return
+        try:
+            await self.cache.aput(query, result)
+        except Exception:
+            pass
+    
+    def _store_cache_many(self, queries: List[str], results: List[AgentResponse]) -> None:
+        """Store responses for a batch of queries, if caching is enabled."""
+        if self.cache is None or not queries:
+            return
+        try:
+            self.cache.put_many(queries, results)
+        except Exception:
+            pass
+    
+    async def _astore_cache_many(self, queries: List[str], results: List[AgentResponse]) -> None:
+        """Asynchronously store responses for a batch of queries, if caching is enabled."""
+        if self.cache is None or not queries:
+            return
+        try:
+            await self.cache.aput_many(queries, results)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _error_response(error: Exception) -> AgentResponse:
+        """Build the default AgentResponse returned when a search fails."""
+        return AgentResponse.model_construct(
+            answer=f"Error occurred during search: {str(error)}",
+            playersName=[]
+        )
 
 
 class ResultProcessor:
@@ -149,23 +667,20 @@ class ResultProcessor:
         Args:
             result: The AgentResponse object to display
         """
-        print("=" * 60)
-        print("AGENT SEARCH RESULTS")
-        print("=" * 60)
+        # Build the whole report first so it is written to stdout in one call
+        lines = [_HEAVY_RULE, "AGENT SEARCH RESULTS", _HEAVY_RULE]
         
         # Display answer if available
         if result.answer:
-            print(f"\nAnswer: {result.answer}")
+            lines += ["", f"Answer: {result.answer}"]
         
         # Display players if available
         if result.playersName:
-            print(f"\n{'─' * 40}")
-            print(f"Players Found: {len(result.playersName)}")
-            print(f"{'─' * 40}")
-            for i, player in enumerate(result.playersName, 1):
-                print(f"  {i}. {player}")
+            lines += ["", _LIGHT_RULE, f"Players Found: {len(result.playersName)}", _LIGHT_RULE]
+            lines += [f"  {i}. {player}" for i, player in enumerate(result.playersName, 1)]
         
-        print("\n" + "=" * 60)
+        lines += ["", _HEAVY_RULE]
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def create_default_agent() -> SearchAgent:
@@ -1,4 +1,4 @@
-REACT_PROMPT_WITH_FORMAT_INSTRUCTIONS="""
+REACT_SYSTEM_PROMPT="""
     Answer the following questions as best you can. You have access to the following tools:
 
     {tools}
@@ -14,7 +14,9 @@ REACT_PROMPT_WITH_FORMAT_INSTRUCTIONS="""
     Final Answer: the final answer to the original input question formatted accroding to format instructions: {format_instructions}
 
     Begin!
+"""
 
+REACT_QUESTION_PROMPT="""
     Question: {input}
     Thought:{agent_scratchpad}
 """
\ No newline at end of file
@@ -1,13 +1,17 @@
 from typing import List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class Source(BaseModel):
     """Schema for a source used by the agent."""
 
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     url: str = Field(description="The URL of the source.")
 
 class AgentResponse(BaseModel):
     """Schema for the agent's response."""
 
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True)
+
     answer: str = Field(description="The agent's answer to the query.")
     playersName: List[str] = Field(default_factory=list, description="List of players' names used to generate the answer.")
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Custom tools for the First Agent.
+
+Wraps the Tavily search tool so a single ReAct step can run several searches
+concurrently instead of spending one LLM round-trip per search.
+"""
+
+import json
+from typing import Any, Dict, List
+
+from langchain_core.tools import BaseTool
+
+
+class MultiSearchTool(BaseTool):
+    """A tool that fans a list of search queries out to a search tool concurrently."""
+
+    name: str = "multi_search"
+    description: str = (
+        "A search engine optimized for comprehensive, accurate, and trusted results. "
+        "Useful for when you need to answer questions about current events. "
+        "Runs several searches at once: input should be a JSON list of search queries, "
+        'e.g. ["first query", "second query"]. A single plain search query also works. '
+        "Prefer one call with all the queries you need over several separate calls."
+    )
+    search: BaseTool
+    max_concurrency: int = 8
+
+    def _run(self, query: str) -> Dict[str, Any]:
+        """Run all queries concurrently in a thread pool."""
+        queries = self._parse_queries(query)
+        results = self.search.batch(
+            queries,
+            config={"max_concurrency": self.max_concurrency},
+            return_exceptions=True
+        )
+        return self._collect(queries, results)
+
+    async def _arun(self, query: str) -> Dict[str, Any]:
+        """Run all queries concurrently on the event loop."""
+        queries = self._parse_queries(query)
+        results = await self.search.abatch(
+            queries,
+            config={"max_concurrency": self.max_concurrency},
+            return_exceptions=True
+        )
+        return self._collect(queries, results)
+
+    @staticmethod
+    def _parse_queries(query: str) -> List[str]:
+        """Split the tool input into individual queries."""
+        try:
+            parsed = json.loads(query)
+        except ValueError:
+            return [query]
+        if isinstance(parsed, list) and parsed:
+            return [str(item) for item in parsed]
+        return [query]
+
+    @staticmethod
+    def _collect(queries: List[str], results: List[Any]) -> Dict[str, Any]:
+        """Map each query to its search result, reporting failures inline."""
+        return {
+            query: {"error": str(result)} if isinstance(result, Exception) else result
+            for query, result in zip(queries, results)
+        }